@@ -8,6 +8,9 @@ import sys
 import subprocess
 import yaml
 
+# Use the libyaml C loader when available for faster config parsing
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 def check_dependencies():
     """Check if all dependencies are installed."""
     try:
@@ -31,7 +34,7 @@ def check_config():
     
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
         
         # Check for required sections
         if 'server' not in config:
@@ -80,10 +83,14 @@ def setup_replit_environment():
     os.makedirs('certs', exist_ok=True)
 
 def run_proxy_server():
-    """Run the proxy server."""
+    """Run the proxy server in this process."""
     print("🚀 Starting proxy server...")
+    # Import and call the entry point directly rather than spawning a
+    # second interpreter; this saves a fork/exec and a full cold start
+    sys.path.insert(0, os.path.join(os.getcwd(), 'src'))
     try:
-        subprocess.run([sys.executable, "src/main.py"])
+        from main import main as proxy_main
+        proxy_main()
     except KeyboardInterrupt:
         print("\n🛑 Proxy server stopped.")
     except Exception as e:
@@ -5,6 +5,7 @@ High-Performance Proxy Server - Main Entry Point
 
 import asyncio
 import logging
+import multiprocessing
 import os
 import signal
 import sys
@@ -12,52 +13,69 @@ from argparse import ArgumentParser
 
 try:
     import uvloop
-    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 except ImportError:
+    uvloop = None
     logging.warning("uvloop not available, falling back to standard event loop")
 
 from proxy.server import ProxyServer
 from proxy.config import load_config
+from proxy.utils import setup_ssl
 
 
 def parse_args():
     """Parse command line arguments."""
     parser = ArgumentParser(description="High-Performance Proxy Server")
     parser.add_argument(
-        "-c", "--config", 
-        default="config/config.yaml", 
+        "-c", "--config",
+        default="config/config.yaml",
         help="Path to configuration file"
     )
     parser.add_argument(
-        "-v", "--verbose", 
-        action="store_true", 
+        "-v", "--verbose",
+        action="store_true",
         help="Enable verbose logging"
     )
     return parser.parse_args()
 
 
-async def shutdown(server, loop, signal=None):
-    """Gracefully shut down the server."""
-    if signal:
-        logging.info(f"Received exit signal {signal.name}...")
-    
+async def _amain(config):
+    """Run the proxy server until a termination signal arrives."""
+    loop = asyncio.get_running_loop()
+
+    server = ProxyServer(config, loop)
+    await server.start_async()
+
+    # Set up signal handlers for graceful shutdown
+    stop_event = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+
+    logging.info(f"Proxy server running on {config['server']['host']}:{config['server']['port']}")
+    await stop_event.wait()
+
     logging.info("Shutting down server...")
     server.close()
     await server.wait_closed()
-    
-    tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
-    for task in tasks:
-        task.cancel()
-    
-    await asyncio.gather(*tasks, return_exceptions=True)
-    loop.stop()
     logging.info("Server shutdown complete.")
 
 
+def _run_worker(config):
+    """
+    Run one server worker on its own event loop.
+
+    uvloop.run manages loop creation, signal-safe teardown and async
+    generator shutdown; asyncio.run is the fallback without uvloop.
+    """
+    if uvloop is not None:
+        uvloop.run(_amain(config))
+    else:
+        asyncio.run(_amain(config))
+
+
 def main():
     """Main entry point for the proxy server."""
     args = parse_args()
-    
+
     # Configure logging
     log_level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(
@@ -65,36 +83,43 @@ def main():
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[logging.StreamHandler()]
     )
-    
+
     # Load configuration
     try:
         config = load_config(args.config)
     except Exception as e:
         logging.error(f"Failed to load configuration: {e}")
         sys.exit(1)
-    
-    # Set up event loop
-    loop = asyncio.get_event_loop()
-    
-    # Create and start the proxy server
+
+    # With server.workers > 1, run one worker process per requested core;
+    # each binds the same port with SO_REUSEPORT so the kernel distributes
+    # accepted connections across workers
+    workers = config['server'].get('workers', 1)
+    if workers == 'auto':
+        workers = os.cpu_count() or 1
+        config['server']['workers'] = workers
+
+    # Warm the SSL context cache in the parent so forked workers inherit
+    # the parsed context instead of each re-parsing the cert chain
+    if config.get('security', {}).get('ssl', {}).get('enabled', False):
+        setup_ssl(config['security']['ssl'])
+
+    children = []
+    for _ in range(workers - 1):
+        child = multiprocessing.Process(target=_run_worker, args=(config,))
+        child.start()
+        children.append(child)
+
     try:
-        server = ProxyServer(config, loop)
-        server.start()
-        
-        # Set up signal handlers for graceful shutdown
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(
-                sig, 
-                lambda sig=sig: asyncio.create_task(shutdown(server, loop, sig))
-            )
-        
-        logging.info(f"Proxy server running on {config['server']['host']}:{config['server']['port']}")
-        loop.run_forever()
+        _run_worker(config)
     except Exception as e:
         logging.error(f"Error starting server: {e}")
         sys.exit(1)
     finally:
-        loop.close()
+        for child in children:
+            child.terminate()
+        for child in children:
+            child.join()
         logging.info("Server process ended")
 
 
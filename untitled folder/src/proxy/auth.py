@@ -2,9 +2,59 @@
 Authentication utilities
 """
 
-import bcrypt
+import asyncio
+import hmac
 import logging
-from typing import Dict, Any
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Tuple
+
+import bcrypt
+
+# Dedicated pool for credential checks so a burst of bcrypt verifications
+# neither blocks the event loop nor competes with the default executor;
+# bcrypt releases the GIL while hashing, so the threads run in parallel
+_AUTH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=(os.cpu_count() or 1) * 2,
+    thread_name_prefix='auth'
+)
+
+# Short-TTL cache of bcrypt verification results so clients that resend the
+# same credentials on every request don't pay the KDF cost each time. The
+# key hides the password behind an HMAC with a per-process random secret,
+# so no password material is stored directly. The lock serializes cache
+# access across the executor threads; its cost is noise next to a bcrypt
+# verification.
+_AUTH_CACHE_SECRET = os.urandom(32)
+_AUTH_CACHE: 'OrderedDict[Tuple[str, str, bytes], Tuple[float, bool]]' = OrderedDict()
+_AUTH_CACHE_LOCK = threading.Lock()
+_AUTH_CACHE_TTL = 30.0
+_AUTH_CACHE_MAX = 4096
+
+
+async def authenticate_user_async(config: Dict[str, Any], username: str, password: str) -> bool:
+    """
+    Authenticate a user without blocking the event loop.
+
+    A cache miss costs a full bcrypt verification (tens of milliseconds),
+    which would stall every other connection if run on the loop; the
+    check runs on the auth thread pool instead.
+
+    Args:
+        config: Server configuration
+        username: Username
+        password: Password
+
+    Returns:
+        True if authentication is successful, False otherwise
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _AUTH_EXECUTOR, authenticate_user, config, username, password
+    )
 
 
 def authenticate_user(config: Dict[str, Any], username: str, password: str) -> bool:
@@ -19,28 +69,55 @@ def authenticate_user(config: Dict[str, Any], username: str, password: str) -> b
     Returns:
         True if authentication is successful, False otherwise
     """
-    # Get authentication configuration
-    auth_config = config.get('security', {}).get('authentication', {})
-    
-    # Get users
-    users = auth_config.get('users', [])
-    
-    # Find user
-    user = next((u for u in users if u['username'] == username), None)
-    if not user:
-        return False
-    
+    # Look the user up in the prebuilt index when available (attached by
+    # load_config); fall back to scanning the configured user list
+    user_index = config.get('_user_index')
+    if user_index is not None:
+        password_hash = user_index.get(username)
+        if password_hash is None:
+            return False
+    else:
+        auth_config = config.get('security', {}).get('authentication', {})
+        users = auth_config.get('users', [])
+        # The fallback runs precisely when _index_users could not build the
+        # index, i.e. when an entry may be malformed — treat missing keys
+        # as a failed match rather than letting KeyError escape
+        user = next((u for u in users if u.get('username') == username), None)
+        if not user:
+            return False
+        password_hash = user.get('password_hash')
+        if password_hash is None:
+            return False
+
     # Check password
     try:
-        password_hash = user['password_hash']
-        
         # Check if the hash is a bcrypt hash
         if password_hash.startswith('$2'):
-            # Verify bcrypt hash
-            return bcrypt.checkpw(
+            # Serve repeat verifications of the same credentials from the
+            # cache; the hash is part of the key so a changed hash always
+            # triggers a fresh bcrypt check
+            key = (
+                username,
+                password_hash,
+                hmac.new(_AUTH_CACHE_SECRET, password.encode('utf-8'), 'sha256').digest()
+            )
+            now = time.monotonic()
+            with _AUTH_CACHE_LOCK:
+                entry = _AUTH_CACHE.get(key)
+                if entry is not None and now - entry[0] < _AUTH_CACHE_TTL:
+                    _AUTH_CACHE.move_to_end(key)
+                    return entry[1]
+
+            # Verify bcrypt hash (outside the lock; this is the slow part)
+            result = bcrypt.checkpw(
                 password.encode('utf-8'),
                 password_hash.encode('utf-8')
             )
+            with _AUTH_CACHE_LOCK:
+                _AUTH_CACHE[key] = (now, result)
+                if len(_AUTH_CACHE) > _AUTH_CACHE_MAX:
+                    _AUTH_CACHE.popitem(last=False)
+            return result
         else:
             # Plain text comparison (not recommended)
             logging.warning("Using plain text password comparison")
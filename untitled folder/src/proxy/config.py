@@ -2,34 +2,167 @@
 Configuration management for the proxy server
 """
 
+import copy
 import os
 import yaml
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Optional, TextIO, Tuple, Union
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
-def load_config(config_path: str) -> Dict[str, Any]:
+# Prefer the libyaml-backed loader when available; it parses the same safe
+# subset of YAML several times faster than the pure-Python fallback
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Supported proxy modes
+_VALID_MODES = frozenset({'forward', 'reverse', 'socks5'})
+
+# Required keys per configuration section; dict keys are set-like, so
+# validation is a subset test instead of a per-key loop
+_REQUIRED_TOP = frozenset({'server', 'proxy'})
+_REQUIRED_SERVER = frozenset({'host', 'port'})
+
+# Parsed-config cache keyed by absolute path, validated by (mtime_ns, size)
+# so an edited file is always re-parsed
+_CONFIG_CACHE: 'OrderedDict[str, Tuple[int, int, Dict[str, Any]]]' = OrderedDict()
+_CONFIG_CACHE_MAX = 32
+
+
+def _index_users(config: Any):
+    """
+    Attach a username -> password_hash index to a parsed configuration.
+
+    authenticate_user uses the index for O(1) lookups instead of scanning
+    the configured user list on every authentication attempt.
+
+    Args:
+        config: The parsed configuration
+    """
+    if not isinstance(config, dict):
+        return
+
+    users = config.get('security', {}).get('authentication', {}).get('users')
+    if not users:
+        return
+
+    try:
+        config['_user_index'] = {u['username']: u['password_hash'] for u in users}
+    except (TypeError, KeyError):
+        logging.warning("Could not build user index from authentication config")
+
+
+def _read_json_sidecar(config_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the JSON sidecar cache for a config file, if it is up to date.
+
+    Args:
+        config_path: Path to the YAML configuration file
+
+    Returns:
+        The parsed configuration, or None if the sidecar is missing,
+        stale or unreadable
+    """
+    sidecar_path = config_path + '.json'
+    try:
+        if os.stat(sidecar_path).st_mtime < os.stat(config_path).st_mtime:
+            return None
+        with open(sidecar_path, 'rb') as f:
+            config = _json.loads(f.read())
+        return config if isinstance(config, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_sidecar(config_path: str, config: Dict[str, Any]):
+    """
+    Write a JSON sidecar cache next to a config file.
+
+    JSON parses much faster than YAML, so later startups can load the
+    sidecar instead of re-parsing the YAML. Failures are ignored; the
+    sidecar is purely an optimization.
+
+    The sidecar mirrors the YAML, credentials included, so it is created
+    owner-only and a pre-existing file's mode is clamped as well.
+
+    Args:
+        config_path: Path to the YAML configuration file
+        config: The parsed configuration
+    """
+    sidecar_path = config_path + '.json'
+    try:
+        data = _json.dumps(config)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        fd = os.open(sidecar_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.fchmod(fd, 0o600)
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def load_config(config_path: Union[str, TextIO]) -> Dict[str, Any]:
     """
     Load configuration from a YAML file.
-    
+
     Args:
-        config_path: Path to the configuration file
-        
+        config_path: Path to the configuration file, or an open file-like
+            object to parse directly
+
     Returns:
         Dict containing the configuration
-        
+
     Raises:
         FileNotFoundError: If the configuration file doesn't exist
         yaml.YAMLError: If the configuration file is invalid
     """
+    # File-like objects are parsed directly; the path-based sidecar and
+    # cache machinery below doesn't apply to them
+    if hasattr(config_path, 'read'):
+        config = yaml.load(config_path, Loader=_YAML_LOADER)
+        _index_users(config)
+        return config
+
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
-    
+
+    # Serve repeated loads of an unchanged file from the cache; callers may
+    # mutate the returned dict, so hand out a copy rather than the original
+    cache_key = os.path.abspath(config_path)
+    stat = os.stat(config_path)
+    cached = _CONFIG_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        _CONFIG_CACHE.move_to_end(cache_key)
+        return copy.deepcopy(cached[2])
+
+    # Prefer a fresh JSON sidecar over re-parsing the YAML
+    config = _read_json_sidecar(config_path)
+    if config is not None:
+        logging.info(f"Loaded configuration from {config_path} (JSON sidecar)")
+        _index_users(config)
+        _CONFIG_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, config)
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+            _CONFIG_CACHE.popitem(last=False)
+        return copy.deepcopy(config)
+
     with open(config_path, 'r') as f:
         try:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
             logging.info(f"Loaded configuration from {config_path}")
-            return config
+            # Write the sidecar before indexing users so the derived
+            # _user_index never reaches disk
+            _write_json_sidecar(config_path, config)
+            _index_users(config)
+            _CONFIG_CACHE[cache_key] = (stat.st_mtime_ns, stat.st_size, config)
+            if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+                _CONFIG_CACHE.popitem(last=False)
+            return copy.deepcopy(config)
         except yaml.YAMLError as e:
             logging.error(f"Error parsing configuration file: {e}")
             raise
@@ -45,34 +178,35 @@ def validate_config(config: Dict[str, Any]) -> bool:
     Returns:
         True if the configuration is valid, False otherwise
     """
-    required_keys = ['server', 'proxy']
-    
     # Check for required top-level keys
-    for key in required_keys:
-        if key not in config:
-            logging.error(f"Missing required configuration key: {key}")
-            return False
-    
-    # Validate server configuration
-    server_config = config.get('server', {})
-    if not all(k in server_config for k in ['host', 'port']):
+    missing = _REQUIRED_TOP - config.keys()
+    if missing:
+        logging.error(f"Missing required configuration keys: {', '.join(sorted(missing))}")
+        return False
+
+    # Each section is fetched once; a missing section yields None rather
+    # than a throwaway empty dict, and the isinstance check covers both
+    # absence and a wrong type
+    server_config = config.get('server')
+    if not isinstance(server_config, dict) or not _REQUIRED_SERVER <= server_config.keys():
         logging.error("Server configuration must include 'host' and 'port'")
         return False
-    
-    # Validate proxy configuration
-    proxy_config = config.get('proxy', {})
-    if 'mode' not in proxy_config:
+
+    proxy_config = config.get('proxy')
+    if not isinstance(proxy_config, dict) or 'mode' not in proxy_config:
         logging.error("Proxy configuration must include 'mode'")
         return False
-    
+
     mode = proxy_config['mode']
-    if mode not in ['forward', 'reverse', 'socks5']:
+    if mode not in _VALID_MODES:
         logging.error(f"Invalid proxy mode: {mode}")
         return False
-    
+
     # Mode-specific validation
-    if mode == 'reverse' and 'targets' not in proxy_config.get('reverse', {}):
-        logging.error("Reverse proxy configuration must include 'targets'")
-        return False
-    
+    if mode == 'reverse':
+        reverse_config = proxy_config.get('reverse')
+        if not isinstance(reverse_config, dict) or 'targets' not in reverse_config:
+            logging.error("Reverse proxy configuration must include 'targets'")
+            return False
+
     return True
@@ -2,6 +2,7 @@
 Base handler for proxy implementations
 """
 
+import asyncio
 import logging
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
@@ -9,6 +10,64 @@ from typing import Dict, Any, Optional
 import aiohttp
 from aiohttp import web
 
+# Hop-by-hop headers (RFC 2616 section 13.5.1) that must not be forwarded;
+# removed with CIMultiDict.popall, which matches case-insensitively in C
+_HOP_BY_HOP = (
+    'Connection', 'Keep-Alive', 'Proxy-Authenticate', 'Proxy-Authorization',
+    'TE', 'Trailers', 'Transfer-Encoding', 'Upgrade'
+)
+
+# Largest upstream response, by declared Content-Length, that is buffered
+# into a plain Response for the cache middleware when caching is enabled;
+# anything larger (or of unknown length) is streamed as before
+_CACHE_BUFFER_LIMIT = 1024 * 1024
+
+# Single client session shared by all handlers so upstream connections,
+# TLS handshakes and DNS lookups are amortized across requests
+_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp client session, creating it on first use.
+
+    Returns:
+        The shared client session
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        async with _session_lock:
+            if _session is None or _session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=0,
+                    limit_per_host=256,
+                    ttl_dns_cache=300,
+                    use_dns_cache=True,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                )
+                _session = aiohttp.ClientSession(
+                    timeout=aiohttp.ClientTimeout(total=30),
+                    connector=connector,
+                    trust_env=False,
+                    # Forward bodies as-is; the proxy should not decode and
+                    # re-encode compressed responses
+                    auto_decompress=False
+                )
+
+    return _session
+
+
+async def close_session():
+    """Close the shared aiohttp client session."""
+    global _session
+
+    if _session and not _session.closed:
+        await _session.close()
+    _session = None
+
 
 class BaseProxyHandler(ABC):
     """
@@ -24,21 +83,8 @@ class BaseProxyHandler(ABC):
         """
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
-        
-        # Create a client session for making requests
-        self.session = None
-    
-    async def setup_session(self):
-        """Set up the aiohttp client session."""
-        if self.session is None or self.session.closed:
-            timeout = aiohttp.ClientTimeout(total=30)
-            self.session = aiohttp.ClientSession(timeout=timeout)
-    
-    async def close_session(self):
-        """Close the aiohttp client session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
-    
+        self._buffer_cacheable = config.get('caching', {}).get('enabled', False)
+
     @abstractmethod
     async def handle(self, request: web.Request) -> web.Response:
         """
@@ -57,7 +103,7 @@ class BaseProxyHandler(ABC):
         request: web.Request, 
         target_url: str,
         headers: Optional[Dict[str, str]] = None
-    ) -> web.Response:
+    ) -> web.StreamResponse:
         """
         Forward a request to a target URL.
         
@@ -69,50 +115,74 @@ class BaseProxyHandler(ABC):
         Returns:
             The response from the target server
         """
-        await self.setup_session()
-        
-        # Prepare headers
-        request_headers = dict(request.headers)
+        session = await get_session()
+
+        # Prepare headers in a CIMultiDict so duplicates (e.g. Set-Cookie)
+        # survive, then strip hop-by-hop headers with case-insensitive
+        # C-level popall calls
+        request_headers = request.headers.copy()
+        for name in _HOP_BY_HOP:
+            request_headers.popall(name, None)
         if headers:
             request_headers.update(headers)
         
-        # Remove hop-by-hop headers
-        hop_by_hop_headers = {
-            'Connection', 'Keep-Alive', 'Proxy-Authenticate', 'Proxy-Authorization',
-            'TE', 'Trailers', 'Transfer-Encoding', 'Upgrade'
-        }
-        for header in hop_by_hop_headers:
-            if header in request_headers:
-                del request_headers[header]
-        
-        # Get request body
-        body = await request.read()
-        
+        response = None
         try:
-            # Forward the request
-            async with self.session.request(
+            # Forward the request, streaming the body in both directions so
+            # bytes in flight stay bounded by the chunk size rather than the
+            # full payload
+            async with session.request(
                 request.method,
                 target_url,
                 headers=request_headers,
-                data=body,
+                data=request.content if request.can_read_body else None,
                 allow_redirects=False,
                 ssl=None  # We'll handle SSL verification separately
             ) as resp:
-                # Read response body
-                response_body = await resp.read()
-                
                 # Prepare response headers
-                response_headers = dict(resp.headers)
-                
-                # Create response
-                return web.Response(
+                response_headers = resp.headers.copy()
+                for name in _HOP_BY_HOP:
+                    response_headers.popall(name, None)
+
+                # With caching enabled, small GET responses are read fully
+                # and returned as plain Responses so cache_middleware can
+                # store the body; a StreamResponse is already on the wire
+                # by the time the middleware sees it
+                if (
+                    self._buffer_cacheable
+                    and request.method == 'GET'
+                    and resp.content_length is not None
+                    and resp.content_length <= _CACHE_BUFFER_LIMIT
+                ):
+                    body = await resp.read()
+                    return web.Response(
+                        status=resp.status,
+                        headers=response_headers,
+                        body=body
+                    )
+
+                # Stream the response body back to the client
+                response = web.StreamResponse(
                     status=resp.status,
-                    headers=response_headers,
-                    body=response_body
+                    headers=response_headers
                 )
+                await response.prepare(request)
+                async for chunk in resp.content.iter_chunked(65536):
+                    await response.write(chunk)
+                await response.write_eof()
+                return response
         except aiohttp.ClientError as e:
-            self.logger.error(f"Error forwarding request to {target_url}: {e}")
-            return web.Response(
-                status=502,
-                text=f"Error forwarding request: {str(e)}"
-            )
+            self.logger.error("Error forwarding request to %s: %s", target_url, e)
+            if response is None or not response.prepared:
+                return web.Response(
+                    status=502,
+                    text=f"Error forwarding request: {str(e)}"
+                )
+            # The status line and part of the body are already on the wire,
+            # so a substitute 502 can't be sent; drop the connection so the
+            # client sees a truncated transfer instead of waiting out the
+            # declared Content-Length
+            response.force_close()
+            if request.transport is not None:
+                request.transport.close()
+            return response
@@ -3,6 +3,7 @@ Forward proxy handler implementation
 """
 
 import base64
+import binascii
 import logging
 import re
 from typing import Dict, Any, Optional, Tuple
@@ -11,7 +12,7 @@ from urllib.parse import urlparse
 from aiohttp import web
 
 from .base import BaseProxyHandler
-from ..auth import authenticate_user
+from ..auth import authenticate_user_async
 
 
 class ForwardProxyHandler(BaseProxyHandler):
@@ -29,27 +30,29 @@ class ForwardProxyHandler(BaseProxyHandler):
         super().__init__(config)
         self.require_auth = config['proxy']['forward'].get('require_auth', False)
         self.allowed_domains = config['proxy']['forward'].get('allowed_domains', [])
-        
-        # Compile domain patterns for faster matching
-        self.domain_patterns = []
-        for domain in self.allowed_domains:
-            pattern = domain.replace('.', r'\.').replace('*', r'.*')
-            self.domain_patterns.append(re.compile(f"^{pattern}$"))
-    
+
+        # Fuse all domain patterns into a single anchored alternation so the
+        # per-request check is one regex match instead of one per pattern
+        if self.allowed_domains:
+            alternation = '|'.join(
+                domain.replace('.', r'\.').replace('*', r'.*')
+                for domain in self.allowed_domains
+            )
+            self._allowed_re = re.compile(f"^(?:{alternation})$")
+        else:
+            self._allowed_re = None
+
     def _is_domain_allowed(self, domain: str) -> bool:
         """
         Check if a domain is allowed.
-        
+
         Args:
             domain: The domain to check
-            
+
         Returns:
             True if the domain is allowed, False otherwise
         """
-        if not self.allowed_domains:
-            return True
-        
-        return any(pattern.match(domain) for pattern in self.domain_patterns)
+        return self._allowed_re is None or self._allowed_re.match(domain) is not None
     
     async def _authenticate(self, request: web.Request) -> Tuple[bool, Optional[str]]:
         """
@@ -67,22 +70,37 @@ class ForwardProxyHandler(BaseProxyHandler):
         auth_header = request.headers.get('Proxy-Authorization')
         if not auth_header:
             return False, "Proxy authentication required"
-        
+
+        auth_type, _, auth_value = auth_header.partition(' ')
+        if auth_type.lower() != 'basic':
+            return False, "Only Basic authentication is supported"
+
+        # Decode to bytes and split once; only the two credential halves
+        # are UTF-8 decoded
         try:
-            auth_type, auth_value = auth_header.split(' ', 1)
-            if auth_type.lower() != 'basic':
-                return False, "Only Basic authentication is supported"
-            
-            decoded = base64.b64decode(auth_value).decode('utf-8')
-            username, password = decoded.split(':', 1)
-            
-            if authenticate_user(self.config, username, password):
+            raw = base64.b64decode(auth_value, validate=True)
+        except (binascii.Error, ValueError):
+            return False, "Invalid credentials"
+
+        sep = raw.find(b':')
+        if sep < 0:
+            return False, "Invalid credentials"
+
+        try:
+            username = raw[:sep].decode('utf-8')
+            password = raw[sep + 1:].decode('utf-8')
+        except UnicodeDecodeError:
+            return False, "Invalid credentials"
+
+        # Fail closed: any unexpected error out of the credential check is
+        # a 407, not a 500 through error_middleware
+        try:
+            if await authenticate_user_async(self.config, username, password):
                 return True, None
-            else:
-                return False, "Invalid credentials"
         except Exception as e:
-            self.logger.error(f"Authentication error: {e}")
+            self.logger.error("Authentication error: %s", e)
             return False, "Authentication error"
+        return False, "Invalid credentials"
     
     async def handle(self, request: web.Request) -> web.Response:
         """
@@ -110,7 +128,15 @@ class ForwardProxyHandler(BaseProxyHandler):
         # For CONNECT method (HTTPS), we need to establish a tunnel
         if request.method == 'CONNECT':
             return await self._handle_connect(request)
-        
+
+        # Reject origin-form requests (a bare path with no scheme or host);
+        # forwarding them would just loop back to this proxy
+        if request.raw_path.startswith('/'):
+            return web.Response(
+                status=404,
+                text=f"No proxy target for path: {request.path}"
+            )
+
         # Check if the domain is allowed
         parsed_url = urlparse(target_url)
         if not self._is_domain_allowed(parsed_url.netloc):
@@ -2,6 +2,9 @@
 Reverse proxy handler implementation
 """
 
+import bisect
+import functools
+import itertools
 import logging
 import random
 from typing import Dict, Any, List, Optional
@@ -12,11 +15,34 @@ from aiohttp import web
 from .base import BaseProxyHandler
 
 
+@functools.lru_cache(maxsize=4096)
+def _join_url(base_url: str, path: str) -> str:
+    """
+    Join a base URL and a path, caching the result.
+
+    urljoin fully parses both URLs on every call; the set of distinct
+    paths behind a reverse proxy is typically small enough that repeated
+    joins become cache hits.
+
+    Args:
+        base_url: The target base URL
+        path: The request path
+
+    Returns:
+        The joined URL
+    """
+    return urljoin(base_url, path)
+
+
 class Target:
     """
     Represents a target server for the reverse proxy.
     """
-    
+
+    # Targets are read on every routed request; slots make those attribute
+    # reads direct descriptor fetches and drop the per-instance __dict__
+    __slots__ = ('name', 'host', 'port', 'ssl', 'weight', 'scheme', 'base_url')
+
     def __init__(self, name: str, host: str, port: int, ssl: bool = False, weight: int = 1):
         """
         Initialize a target.
@@ -46,7 +72,7 @@ class Target:
         Returns:
             The full URL
         """
-        return urljoin(self.base_url, path)
+        return _join_url(self.base_url, path)
 
 
 class ReverseProxyHandler(BaseProxyHandler):
@@ -80,10 +106,20 @@ class ReverseProxyHandler(BaseProxyHandler):
             )
             self.targets[target.name] = target
         
-        # Load path routing
+        # Precompute cumulative weights for the full target pool so weighted
+        # selection is a binary search instead of an O(N) walk
+        self.target_list = list(self.targets.values())
+        self._cum_weights = list(
+            itertools.accumulate(target.weight for target in self.target_list)
+        )
+
+        # Load path routing; prefixes are sorted longest-first once so the
+        # per-request lookup can stop at the first (and therefore longest)
+        # match instead of scanning every prefix
         self.path_routing = reverse_config.get('path_routing', {})
-        
-        self.logger.info(f"Initialized reverse proxy with {len(self.targets)} targets")
+        self._routing_prefixes = sorted(self.path_routing, key=len, reverse=True)
+
+        self.logger.info("Initialized reverse proxy with %d targets", len(self.targets))
     
     def _get_target_for_path(self, path: str) -> Optional[Target]:
         """
@@ -95,40 +131,34 @@ class ReverseProxyHandler(BaseProxyHandler):
         Returns:
             The target for the path, or None if no target is found
         """
-        # Find the longest matching path prefix
-        matching_prefix = None
-        for prefix in self.path_routing:
+        # Prefixes are pre-sorted longest-first, so the first match wins
+        for prefix in self._routing_prefixes:
             if path.startswith(prefix):
-                if matching_prefix is None or len(prefix) > len(matching_prefix):
-                    matching_prefix = prefix
-        
-        if matching_prefix is None:
-            return None
-        
-        target_name = self.path_routing[matching_prefix]
-        return self.targets.get(target_name)
+                return self.targets.get(self.path_routing[prefix])
+
+        return None
     
-    def _select_target(self, targets: List[Target]) -> Target:
+    def _select_target(self, targets: Optional[List[Target]] = None) -> Target:
         """
         Select a target using weighted random selection.
-        
+
         Args:
-            targets: List of targets to choose from
-            
+            targets: List of targets to choose from; defaults to the full
+                target pool, for which cumulative weights are precomputed
+
         Returns:
             The selected target
         """
-        total_weight = sum(target.weight for target in targets)
-        r = random.uniform(0, total_weight)
-        upto = 0
-        
-        for target in targets:
-            upto += target.weight
-            if upto >= r:
-                return target
-        
-        # Fallback to the first target
-        return targets[0]
+        if targets is None or targets is self.target_list:
+            targets = self.target_list
+            cum_weights = self._cum_weights
+        else:
+            cum_weights = list(
+                itertools.accumulate(target.weight for target in targets)
+            )
+
+        i = bisect.bisect_right(cum_weights, random.random() * cum_weights[-1])
+        return targets[min(i, len(targets) - 1)]
     
     async def handle(self, request: web.Request) -> web.Response:
         """
@@ -3,12 +3,167 @@ SOCKS5 proxy handler implementation
 """
 
 import asyncio
+import errno
 import logging
+import os
 import socket
 import struct
+import sys
 from typing import Dict, Any, Tuple, Optional
 
-from ..auth import authenticate_user
+from ..auth import authenticate_user_async
+
+# Precompiled wire formats; struct.pack/unpack with a literal format string
+# re-parses the format on every call
+_BB = struct.Struct('!BB')
+_HDR = struct.Struct('!BBBB')
+_PORT = struct.Struct('!H')
+
+# The username/password subnegotiation replies are constant
+_AUTH_SUCCESS = _BB.pack(0x01, 0x00)
+_AUTH_FAIL = _BB.pack(0x01, 0x01)
+
+# Wire form of the default '0.0.0.0' bind address, which nearly every
+# reply carries; having it ready skips an inet_pton call per reply
+_ZERO_V4_ADDR = b'\x00\x00\x00\x00'
+
+# Zero-copy forwarding support: on Linux, splice(2) can move bytes between
+# two sockets through a kernel pipe without ever copying them to userspace
+_HAS_SPLICE = sys.platform == 'linux' and hasattr(os, 'splice')
+_SPLICE_CHUNK = 1 << 20
+if _HAS_SPLICE:
+    _SPLICE_FLAGS = os.SPLICE_F_MOVE | os.SPLICE_F_NONBLOCK | os.SPLICE_F_MORE
+
+
+class _SpliceUnavailable(Exception):
+    """Raised when splice(2) refuses the descriptors before any data moved."""
+
+
+# Pool of kernel pipes reused across tunnels, so each forwarding direction
+# doesn't pay a pipe2 syscall per connection
+_PIPE_POOL: list = []
+_PIPE_POOL_MAX = 32
+
+
+def _acquire_pipe() -> Tuple[int, int]:
+    """Get a nonblocking pipe, reusing a pooled one when available."""
+    if _PIPE_POOL:
+        return _PIPE_POOL.pop()
+    return os.pipe2(os.O_NONBLOCK)
+
+
+def _release_pipe(pipe_r: int, pipe_w: int, drained: bool):
+    """
+    Return a pipe to the pool, or close it.
+
+    Args:
+        pipe_r: Read end of the pipe
+        pipe_w: Write end of the pipe
+        drained: Whether the pipe is known to be empty; only drained pipes
+            are safe to reuse
+    """
+    if drained and len(_PIPE_POOL) < _PIPE_POOL_MAX:
+        _PIPE_POOL.append((pipe_r, pipe_w))
+    else:
+        os.close(pipe_r)
+        os.close(pipe_w)
+
+
+def _set_ready(fut: asyncio.Future):
+    if not fut.done():
+        fut.set_result(None)
+
+
+async def _wait_readable(fd: int):
+    """Wait until a file descriptor is readable."""
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    loop.add_reader(fd, _set_ready, fut)
+    try:
+        await fut
+    finally:
+        loop.remove_reader(fd)
+
+
+async def _wait_writable(fd: int):
+    """Wait until a file descriptor is writable."""
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    loop.add_writer(fd, _set_ready, fut)
+    try:
+        await fut
+    finally:
+        loop.remove_writer(fd)
+
+
+# TCP_NOTSENT_LOWAT (Linux 3.12+) bounds how much unsent data the kernel
+# accepts beyond what is in flight, which keeps drain() meaningful
+_HAS_NOTSENT_LOWAT = hasattr(socket, 'TCP_NOTSENT_LOWAT')
+_NOTSENT_LOWAT = 16384
+
+
+def _tune_socket(writer: asyncio.StreamWriter):
+    """
+    Apply latency-oriented TCP options to a connection.
+
+    Disables Nagle's algorithm — asyncio only guarantees that for
+    client-side sockets, not accepted ones — and caps the kernel's
+    unsent buffer where TCP_NOTSENT_LOWAT is available.
+
+    Args:
+        writer: Stream writer whose underlying socket to tune
+    """
+    sock = writer.get_extra_info('socket')
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if _HAS_NOTSENT_LOWAT:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NOTSENT_LOWAT, _NOTSENT_LOWAT)
+    except OSError:
+        # Tuning is best-effort; an unsupported option is not an error
+        pass
+
+
+async def _race(first: asyncio.Task, second: asyncio.Task) -> Tuple[asyncio.Task, ...]:
+    """
+    Wait until either task finishes, then cancel and reap the other.
+
+    Does the work of asyncio.wait(FIRST_COMPLETED) for the two-task case
+    with a single future and two done-callbacks, instead of the per-call
+    set allocations the general version pays.
+
+    Args:
+        first: One forwarding task
+        second: The other forwarding task
+
+    Returns:
+        The tasks that ran to completion (not cancelled)
+    """
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+
+    def _on_done(_task: asyncio.Task):
+        if not fut.done():
+            fut.set_result(None)
+
+    first.add_done_callback(_on_done)
+    second.add_done_callback(_on_done)
+    await fut
+
+    finished = []
+    for task in (first, second):
+        if task.done():
+            finished.append(task)
+        else:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                pass
+    return tuple(finished)
 
 
 class Socks5ProxyHandler:
@@ -55,6 +210,21 @@ class Socks5ProxyHandler:
         self.config = config
         self.logger = logging.getLogger(self.__class__.__name__)
         self.require_auth = config['proxy']['socks5'].get('require_auth', False)
+        # Forwarding chunk size for the stream-based fallback path; small
+        # buffers multiply syscall and drain overhead on bulk transfers
+        self.buffer_size = config['proxy'].get('tcp_buffer_size', 65536)
+
+        # Resolve per-connection branching once at construction: the
+        # accepted auth method (and its prepacked reply) never changes,
+        # and command handling becomes a dict dispatch
+        self._auth_method = self.USERNAME_PASSWORD if self.require_auth else self.NO_AUTH
+        self._method_reply = _BB.pack(self.VERSION, self._auth_method)
+        self._do_auth = self._authenticate if self.require_auth else self._skip_auth
+        self._cmd_dispatch = {
+            self.CONNECT: self._handle_connect,
+            self.BIND: self._handle_bind,
+            self.UDP_ASSOCIATE: self._handle_udp_associate,
+        }
     
     async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """
@@ -64,6 +234,12 @@ class Socks5ProxyHandler:
             reader: Stream reader for the client connection
             writer: Stream writer for the client connection
         """
+        # A zero high-water mark makes writes land in the kernel socket
+        # buffer immediately instead of being copied into asyncio's
+        # internal buffer first; drain() then tracks the kernel buffer
+        writer.transport.set_write_buffer_limits(high=0)
+        _tune_socket(writer)
+
         try:
             # Perform the SOCKS5 handshake
             if not await self._handshake(reader, writer):
@@ -72,7 +248,7 @@ class Socks5ProxyHandler:
             # Process the client request
             await self._process_request(reader, writer)
         except Exception as e:
-            self.logger.error(f"Error handling SOCKS5 connection: {e}")
+            self.logger.error("Error handling SOCKS5 connection: %s", e)
         finally:
             writer.close()
             await writer.wait_closed()
@@ -90,42 +266,42 @@ class Socks5ProxyHandler:
         """
         # Read the client greeting
         try:
-            version, nmethods = struct.unpack('!BB', await reader.readexactly(2))
+            version, nmethods = _BB.unpack(await reader.readexactly(2))
         except asyncio.IncompleteReadError:
             self.logger.error("Failed to read SOCKS5 greeting")
             return False
         
         if version != self.VERSION:
-            self.logger.error(f"Unsupported SOCKS version: {version}")
-            writer.write(struct.pack('!BB', self.VERSION, self.NO_ACCEPTABLE_METHODS))
-            await writer.drain()
+            # No drain on rejection paths: the connection is closed right
+            # after, and close()/wait_closed() flush the buffered reply
+            self.logger.error("Unsupported SOCKS version: %s", version)
+            writer.write(_BB.pack(self.VERSION, self.NO_ACCEPTABLE_METHODS))
             return False
         
         # Read the authentication methods supported by the client
         methods = await reader.readexactly(nmethods)
         
-        # Select an authentication method
-        if self.require_auth and self.USERNAME_PASSWORD in methods:
-            # Username/password authentication
-            writer.write(struct.pack('!BB', self.VERSION, self.USERNAME_PASSWORD))
+        # Select an authentication method; the accepted method and its
+        # subnegotiation were bound at construction
+        if self._auth_method in methods:
+            writer.write(self._method_reply)
             await writer.drain()
-            
-            # Perform username/password authentication
-            if not await self._authenticate(reader, writer):
+
+            if not await self._do_auth(reader, writer):
                 return False
-        elif self.NO_AUTH in methods and not self.require_auth:
-            # No authentication required
-            writer.write(struct.pack('!BB', self.VERSION, self.NO_AUTH))
-            await writer.drain()
         else:
             # No acceptable authentication methods
             self.logger.error("No acceptable authentication methods")
-            writer.write(struct.pack('!BB', self.VERSION, self.NO_ACCEPTABLE_METHODS))
-            await writer.drain()
+            writer.write(_BB.pack(self.VERSION, self.NO_ACCEPTABLE_METHODS))
             return False
-        
+
         return True
-    
+
+    @staticmethod
+    async def _skip_auth(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """No-op subnegotiation bound as _do_auth when auth is disabled."""
+        return True
+
     async def _authenticate(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
         """
         Perform username/password authentication.
@@ -141,9 +317,8 @@ class Socks5ProxyHandler:
             # Read the authentication request
             ver = await reader.readexactly(1)
             if ver[0] != 0x01:
-                self.logger.error(f"Unsupported auth version: {ver[0]}")
-                writer.write(struct.pack('!BB', 0x01, 0x01))  # Failure
-                await writer.drain()
+                self.logger.error("Unsupported auth version: %s", ver[0])
+                writer.write(_AUTH_FAIL)
                 return False
             
             # Read username
@@ -158,18 +333,16 @@ class Socks5ProxyHandler:
             username_str = username.decode('utf-8')
             password_str = password.decode('utf-8')
             
-            if authenticate_user(self.config, username_str, password_str):
-                writer.write(struct.pack('!BB', 0x01, 0x00))  # Success
+            if await authenticate_user_async(self.config, username_str, password_str):
+                writer.write(_AUTH_SUCCESS)
                 await writer.drain()
                 return True
             else:
-                writer.write(struct.pack('!BB', 0x01, 0x01))  # Failure
-                await writer.drain()
+                writer.write(_AUTH_FAIL)
                 return False
         except Exception as e:
-            self.logger.error(f"Authentication error: {e}")
-            writer.write(struct.pack('!BB', 0x01, 0x01))  # Failure
-            await writer.drain()
+            self.logger.error("Authentication error: %s", e)
+            writer.write(_AUTH_FAIL)
             return False
     
     async def _process_request(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
@@ -182,10 +355,10 @@ class Socks5ProxyHandler:
         """
         try:
             # Read the request header
-            version, cmd, rsv, atyp = struct.unpack('!BBBB', await reader.readexactly(4))
+            version, cmd, rsv, atyp = _HDR.unpack(await reader.readexactly(4))
             
             if version != self.VERSION:
-                self.logger.error(f"Unsupported SOCKS version: {version}")
+                self.logger.error("Unsupported SOCKS version: %s", version)
                 await self._send_reply(writer, self.GENERAL_FAILURE)
                 return
             
@@ -201,25 +374,22 @@ class Socks5ProxyHandler:
                 # IPv6 address
                 addr = socket.inet_ntop(socket.AF_INET6, await reader.readexactly(16))
             else:
-                self.logger.error(f"Unsupported address type: {atyp}")
+                self.logger.error("Unsupported address type: %s", atyp)
                 await self._send_reply(writer, self.ADDRESS_TYPE_NOT_SUPPORTED)
                 return
             
             # Get the destination port
-            port = struct.unpack('!H', await reader.readexactly(2))[0]
+            port, = _PORT.unpack(await reader.readexactly(2))
             
-            # Handle the command
-            if cmd == self.CONNECT:
-                await self._handle_connect(reader, writer, addr, port)
-            elif cmd == self.BIND:
-                await self._handle_bind(reader, writer, addr, port)
-            elif cmd == self.UDP_ASSOCIATE:
-                await self._handle_udp_associate(reader, writer, addr, port)
+            # Handle the command via the dispatch table built in __init__
+            handler = self._cmd_dispatch.get(cmd)
+            if handler is not None:
+                await handler(reader, writer, addr, port)
             else:
-                self.logger.error(f"Unsupported command: {cmd}")
+                self.logger.error("Unsupported command: %s", cmd)
                 await self._send_reply(writer, self.COMMAND_NOT_SUPPORTED)
         except Exception as e:
-            self.logger.error(f"Error processing SOCKS5 request: {e}")
+            self.logger.error("Error processing SOCKS5 request: %s", e)
             await self._send_reply(writer, self.GENERAL_FAILURE)
     
     async def _handle_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, addr: str, port: int):
@@ -234,9 +404,14 @@ class Socks5ProxyHandler:
         """
         try:
             # Connect to the destination
-            self.logger.info(f"Connecting to {addr}:{port}")
-            dest_reader, dest_writer = await asyncio.open_connection(addr, port)
-            
+            self.logger.info("Connecting to %s:%d", addr, port)
+            dest_reader, dest_writer = await asyncio.open_connection(
+                addr, port, limit=self.buffer_size
+            )
+            dest_writer.transport.set_write_buffer_limits(high=0)
+            _tune_socket(dest_writer)
+
+
             # Send success reply
             local_addr, local_port = writer.get_extra_info('sockname')
             await self._send_reply(writer, self.SUCCEEDED, local_addr, local_port)
@@ -246,7 +421,7 @@ class Socks5ProxyHandler:
         except asyncio.CancelledError:
             raise
         except Exception as e:
-            self.logger.error(f"Error handling CONNECT: {e}")
+            self.logger.error("Error handling CONNECT: %s", e)
             await self._send_reply(writer, self.GENERAL_FAILURE)
     
     async def _handle_bind(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, addr: str, port: int):
@@ -287,7 +462,12 @@ class Socks5ProxyHandler:
         """
         try:
             # Convert the bind address to bytes
-            if ':' in bind_addr:
+            if bind_addr == '0.0.0.0':
+                # Default wildcard address: every failure reply and most
+                # success replies use it, so it is precomputed
+                atyp = self.IPV4
+                addr_bytes = _ZERO_V4_ADDR
+            elif ':' in bind_addr:
                 # IPv6
                 atyp = self.IPV6
                 addr_bytes = socket.inet_pton(socket.AF_INET6, bind_addr)
@@ -296,14 +476,19 @@ class Socks5ProxyHandler:
                 atyp = self.IPV4
                 addr_bytes = socket.inet_pton(socket.AF_INET, bind_addr)
             
-            # Build the reply
-            reply = struct.pack('!BBBB', self.VERSION, reply_code, 0x00, atyp) + addr_bytes + struct.pack('!H', bind_port)
-            
-            # Send the reply
+            # Assemble the reply in one preallocated buffer; for a reply
+            # this small a single write beats scatter-gathering three
+            # separately allocated pieces
+            addr_len = len(addr_bytes)
+            reply = bytearray(6 + addr_len)
+            _HDR.pack_into(reply, 0, self.VERSION, reply_code, 0x00, atyp)
+            reply[4:4 + addr_len] = addr_bytes
+            _PORT.pack_into(reply, 4 + addr_len, bind_port)
+
             writer.write(reply)
             await writer.drain()
         except Exception as e:
-            self.logger.error(f"Error sending reply: {e}")
+            self.logger.error("Error sending reply: %s", e)
     
     async def _forward_data(
         self,
@@ -321,24 +506,196 @@ class Socks5ProxyHandler:
             dest_reader: Stream reader for the destination connection
             dest_writer: Stream writer for the destination connection
         """
-        # Create tasks for forwarding data in both directions
+        # For plain TCP tunnels, take over the raw sockets: splice bridges
+        # them entirely in the kernel, and the recv_into pump reuses one
+        # preallocated buffer per direction instead of allocating a fresh
+        # bytes object per chunk like the stream layer does
+        if self._can_splice(client_writer, dest_writer):
+            client_writer.transport.pause_reading()
+            dest_writer.transport.pause_reading()
+
+            # Flush anything the stream readers buffered before we took
+            # over the raw descriptors
+            for reader, writer in ((client_reader, dest_writer), (dest_reader, client_writer)):
+                buffered = getattr(reader, '_buffer', None)
+                if buffered:
+                    writer.write(bytes(buffered))
+                    buffered.clear()
+                    await writer.drain()
+
+            # Work on duplicated sockets: the originals stay owned by the
+            # paused transports, and the event loop refuses readiness
+            # callbacks on fds that belong to a transport
+            client_sock = client_writer.get_extra_info('socket').dup()
+            dest_sock = dest_writer.get_extra_info('socket').dup()
+            client_sock.setblocking(False)
+            dest_sock.setblocking(False)
+
+            try:
+                if _HAS_SPLICE:
+                    try:
+                        await self._splice_data(client_sock.fileno(), dest_sock.fileno())
+                        return
+                    except _SpliceUnavailable:
+                        # splice refused the descriptors before any data
+                        # moved; the recv_into pump below takes over
+                        pass
+                await self._pump_data(client_sock, dest_sock)
+                return
+            finally:
+                client_sock.close()
+                dest_sock.close()
+                dest_writer.close()
+                await dest_writer.wait_closed()
+
+        # Bulk phase: the zero high-water mark set for the handshake would
+        # make every drain() suspend once the kernel buffer fills, so give
+        # the transports a real window — drain() then only parks the
+        # coroutine when 256 KiB is actually buffered
+        client_writer.transport.set_write_buffer_limits(high=256 * 1024, low=64 * 1024)
+        dest_writer.transport.set_write_buffer_limits(high=256 * 1024, low=64 * 1024)
+
+        # Create tasks for forwarding data in both directions and wait
+        # for either to complete; _race cancels the other
         client_to_dest = asyncio.create_task(self._forward(client_reader, dest_writer, 'client -> dest'))
         dest_to_client = asyncio.create_task(self._forward(dest_reader, client_writer, 'dest -> client'))
-        
-        # Wait for either task to complete
-        done, pending = await asyncio.wait(
-            [client_to_dest, dest_to_client],
-            return_when=asyncio.FIRST_COMPLETED
-        )
-        
-        # Cancel the pending task
-        for task in pending:
-            task.cancel()
-        
+        await _race(client_to_dest, dest_to_client)
+
         # Close the destination connection
         dest_writer.close()
         await dest_writer.wait_closed()
     
+    @staticmethod
+    def _can_splice(client_writer: asyncio.StreamWriter, dest_writer: asyncio.StreamWriter) -> bool:
+        """
+        Check whether both connections can be bridged with splice(2).
+
+        Args:
+            client_writer: Stream writer for the client connection
+            dest_writer: Stream writer for the destination connection
+
+        Returns:
+            True if both endpoints are plain TCP sockets
+        """
+        for writer in (client_writer, dest_writer):
+            if writer.get_extra_info('socket') is None:
+                return False
+            if writer.get_extra_info('ssl_object') is not None:
+                return False
+        return True
+
+    async def _splice_data(self, client_fd: int, dest_fd: int):
+        """
+        Forward data between client and destination using splice(2).
+
+        Both directions are driven by kernel-side splice calls on the
+        duplicated descriptors handed over by _forward_data.
+
+        Args:
+            client_fd: Duplicated client socket file descriptor
+            dest_fd: Duplicated destination socket file descriptor
+
+        Raises:
+            _SpliceUnavailable: If splice(2) rejects the descriptors before
+                any data has been forwarded
+        """
+        client_to_dest = asyncio.create_task(self._splice(client_fd, dest_fd, 'client -> dest'))
+        dest_to_client = asyncio.create_task(self._splice(dest_fd, client_fd, 'dest -> client'))
+
+        for task in await _race(client_to_dest, dest_to_client):
+            exc = task.exception()
+            if isinstance(exc, _SpliceUnavailable):
+                raise exc
+            if exc is not None:
+                self.logger.error("Error in splice tunnel: %s", exc)
+
+    async def _pump_data(self, client_sock, dest_sock):
+        """
+        Forward data between client and destination with recv_into.
+
+        Fallback when splice(2) is unavailable: each direction reads into
+        a single preallocated buffer with sock_recv_into, so the steady
+        state allocates no per-chunk bytes objects.
+
+        Args:
+            client_sock: Duplicated client socket
+            dest_sock: Duplicated destination socket
+        """
+        client_to_dest = asyncio.create_task(self._pump(client_sock, dest_sock, 'client -> dest'))
+        dest_to_client = asyncio.create_task(self._pump(dest_sock, client_sock, 'dest -> client'))
+        await _race(client_to_dest, dest_to_client)
+
+    async def _pump(self, src_sock, dst_sock, direction: str):
+        """
+        Forward one direction of a tunnel via a reusable buffer.
+
+        Args:
+            src_sock: Source socket
+            dst_sock: Destination socket
+            direction: Direction of data flow (for logging)
+        """
+        loop = asyncio.get_running_loop()
+        buffer = bytearray(self.buffer_size)
+        view = memoryview(buffer)
+        try:
+            while True:
+                n = await loop.sock_recv_into(src_sock, buffer)
+                if not n:
+                    return
+                await loop.sock_sendall(dst_sock, view[:n])
+        except OSError as e:
+            self.logger.error("Error forwarding data (%s): %s", direction, e)
+
+    async def _splice(self, src_fd: int, dst_fd: int, direction: str):
+        """
+        Forward one direction of a tunnel entirely in the kernel.
+
+        Args:
+            src_fd: Source socket file descriptor
+            dst_fd: Destination socket file descriptor
+            direction: Direction of data flow (for logging)
+
+        Raises:
+            _SpliceUnavailable: If splice(2) rejects the descriptors before
+                any data has been forwarded
+        """
+        pipe_r, pipe_w = _acquire_pipe()
+        moved = False
+        drained = True
+        try:
+            while True:
+                # Pull from the source socket into the pipe
+                try:
+                    n = os.splice(src_fd, pipe_w, _SPLICE_CHUNK, flags=_SPLICE_FLAGS)
+                except BlockingIOError:
+                    # The pipe is drained below, so EAGAIN here always
+                    # means the source has no data yet
+                    await _wait_readable(src_fd)
+                    continue
+                except OSError as e:
+                    if not moved and e.errno in (errno.EINVAL, errno.ENOSYS):
+                        raise _SpliceUnavailable from e
+                    self.logger.error("Error forwarding data (%s): %s", direction, e)
+                    return
+
+                if n == 0:
+                    return
+                moved = True
+                drained = False
+
+                # Push the pipe contents to the destination socket
+                while n:
+                    try:
+                        n -= os.splice(pipe_r, dst_fd, n, flags=_SPLICE_FLAGS)
+                    except BlockingIOError:
+                        await _wait_writable(dst_fd)
+                    except OSError as e:
+                        self.logger.error("Error forwarding data (%s): %s", direction, e)
+                        return
+                drained = True
+        finally:
+            _release_pipe(pipe_r, pipe_w, drained)
+
     async def _forward(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, direction: str):
         """
         Forward data from a reader to a writer.
@@ -350,12 +707,12 @@ class Socks5ProxyHandler:
         """
         try:
             while True:
-                data = await reader.read(8192)
+                data = await reader.read(self.buffer_size)
                 if not data:
                     break
                 writer.write(data)
                 await writer.drain()
         except Exception as e:
-            self.logger.error(f"Error forwarding data ({direction}): {e}")
+            self.logger.error("Error forwarding data (%s): %s", direction, e)
         finally:
             writer.close()
@@ -2,46 +2,61 @@
 Middleware package for the proxy server
 """
 
-from typing import Dict, Any, List, Callable
+import functools
+from typing import Dict, Any
 
 from aiohttp import web
 
 from .error import error_middleware
 from .auth import auth_middleware
-from .rate_limit import rate_limit_middleware
+from .rate_limit import rate_limit_middleware, get_rate_limiter
 from .logging import logging_middleware
-from .cache import cache_middleware
+from .cache import cache_middleware, get_cache
 
 
 def setup_middlewares(app: web.Application, config: Dict[str, Any]):
     """
     Set up middlewares for the application.
-    
+
     Args:
         app: The web application
         config: Server configuration
     """
-    # Add middlewares in the correct order
-    middlewares = []
-    
-    # Add logging middleware
-    middlewares.append(logging_middleware)
-    
+    # Bind per-middleware state with functools.partial rather than
+    # lambdas: partials dispatch in C, and the configuration lookups are
+    # resolved once here instead of on every request. web.middleware marks
+    # the partials new-style so aiohttp calls them with (request, handler)
+    # instead of treating them as legacy (app, handler) factories
+    security = config.get('security', {})
+
+    # Add logging middleware unless access logging is turned off; every
+    # middleware costs a coroutine frame per request even when it only
+    # forwards, so disabled features should not be wrapped at all
+    if config.get('logging', {}).get('access', True):
+        app.middlewares.append(logging_middleware)
+
     # Add authentication middleware if enabled
-    if config.get('security', {}).get('authentication', {}).get('enabled', False):
-        middlewares.append(lambda request, handler: auth_middleware(request, handler, config))
-    
+    auth_config = security.get('authentication', {})
+    if auth_config.get('enabled', False):
+        app.middlewares.append(web.middleware(functools.partial(
+            auth_middleware,
+            config=config,
+            method=auth_config.get('method', 'basic')
+        )))
+
     # Add rate limiting middleware if enabled
-    if config.get('security', {}).get('rate_limiting', {}).get('enabled', False):
-        middlewares.append(lambda request, handler: rate_limit_middleware(request, handler, config))
-    
+    if security.get('rate_limiting', {}).get('enabled', False):
+        app.middlewares.append(web.middleware(functools.partial(
+            rate_limit_middleware,
+            limiter=get_rate_limiter(config)
+        )))
+
     # Add caching middleware if enabled
     if config.get('caching', {}).get('enabled', False):
-        middlewares.append(lambda request, handler: cache_middleware(request, handler, config))
-    
-    # Apply middlewares
-    for middleware in middlewares:
-        app.middlewares.append(middleware)
+        app.middlewares.append(web.middleware(functools.partial(
+            cache_middleware,
+            cache=get_cache(config)
+        )))
 
 
 __all__ = [
@@ -8,30 +8,33 @@ from typing import Dict, Any, Callable
 
 from aiohttp import web
 
-from ..auth import authenticate_user
+from ..auth import authenticate_user_async
 
+# Paths exempt from authentication
+_SKIP_PATHS = frozenset({'/metrics', '/health'})
 
-async def auth_middleware(request: web.Request, handler: Callable, config: Dict[str, Any]) -> web.Response:
+# Challenge headers for 401 responses; built once since every rejection
+# carries the same header. web.Response copies it into its own multidict
+_CHALLENGE_HEADERS = {'WWW-Authenticate': 'Basic realm="Proxy"'}
+
+
+async def auth_middleware(request: web.Request, handler: Callable, config: Dict[str, Any], method: str = 'basic') -> web.Response:
     """
     Middleware for authenticating requests.
-    
+
     Args:
         request: The incoming request
         handler: The request handler
         config: Server configuration
-        
+        method: Authentication method, resolved once by setup_middlewares
+
     Returns:
         The response
     """
     # Skip authentication for certain paths
-    skip_paths = ['/metrics', '/health']
-    if request.path in skip_paths:
+    if request.path in _SKIP_PATHS:
         return await handler(request)
-    
-    # Get authentication configuration
-    auth_config = config.get('security', {}).get('authentication', {})
-    method = auth_config.get('method', 'basic')
-    
+
     # Authenticate based on the method
     if method == 'basic':
         return await _basic_auth(request, handler, config)
@@ -63,7 +66,7 @@ async def _basic_auth(request: web.Request, handler: Callable, config: Dict[str,
     if not auth_header:
         return web.Response(
             status=401,
-            headers={'WWW-Authenticate': 'Basic realm="Proxy"'},
+            headers=_CHALLENGE_HEADERS,
             text="Authentication required"
         )
     
@@ -72,28 +75,28 @@ async def _basic_auth(request: web.Request, handler: Callable, config: Dict[str,
         if auth_type.lower() != 'basic':
             return web.Response(
                 status=401,
-                headers={'WWW-Authenticate': 'Basic realm="Proxy"'},
+                headers=_CHALLENGE_HEADERS,
                 text="Only Basic authentication is supported"
             )
         
         decoded = base64.b64decode(auth_value).decode('utf-8')
         username, password = decoded.split(':', 1)
         
-        if authenticate_user(config, username, password):
+        if await authenticate_user_async(config, username, password):
             # Authentication successful
             return await handler(request)
         else:
             # Authentication failed
             return web.Response(
                 status=401,
-                headers={'WWW-Authenticate': 'Basic realm="Proxy"'},
+                headers=_CHALLENGE_HEADERS,
                 text="Invalid credentials"
             )
     except Exception as e:
         logging.error(f"Authentication error: {e}")
         return web.Response(
             status=401,
-            headers={'WWW-Authenticate': 'Basic realm="Proxy"'},
+            headers=_CHALLENGE_HEADERS,
             text="Authentication error"
         )
 
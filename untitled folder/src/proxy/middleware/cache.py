@@ -3,91 +3,124 @@ Caching middleware
 """
 
 import hashlib
-import json
+import heapq
 import logging
 import time
-from typing import Dict, Any, Callable, Optional
+from collections import OrderedDict
+from typing import Dict, Any, Callable, List, Optional, Tuple
 
 from aiohttp import web
+from multidict import CIMultiDict
+
+# Paths exempt from caching
+_SKIP_PATHS = frozenset({'/metrics', '/health'})
+
+
+class _CacheEntry:
+    """
+    A cached response.
+
+    Slots keep each entry to five direct attribute references instead of
+    a pair of nested dicts with hashed string lookups.
+    """
+
+    __slots__ = ('status', 'headers', 'body', 'expires', 'size')
+
+    def __init__(self, status: int, headers: 'CIMultiDict[str]', body: bytes, expires: float, size: int):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.expires = expires
+        self.size = size
 
 
 # Simple in-memory cache
 class MemoryCache:
     """
-    Simple in-memory cache.
+    Simple in-memory cache with LRU eviction and TTL expiry.
     """
-    
+
     def __init__(self, ttl: int, max_size: int):
         """
         Initialize the cache.
-        
+
         Args:
             ttl: Time-to-live in seconds
             max_size: Maximum cache size in MB
         """
         self.ttl = ttl
         self.max_size = max_size * 1024 * 1024  # Convert to bytes
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        # Insertion/access order doubles as the LRU order; the heap tracks
+        # expiry times so _evict can drop expired entries without scanning
+        self.cache: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._expiry_heap: List[Tuple[float, str]] = []
         self.size = 0
     
-    def get(self, key: str) -> Optional[Dict[str, Any]]:
+    def get(self, key: str) -> Optional[_CacheEntry]:
         """
-        Get a value from the cache.
-        
+        Get an entry from the cache.
+
         Args:
             key: Cache key
-            
+
         Returns:
-            The cached value, or None if not found or expired
+            The cached entry, or None if not found or expired
         """
-        if key not in self.cache:
+        entry = self.cache.get(key)
+        if entry is None:
             return None
-        
-        entry = self.cache[key]
-        
+
         # Check if entry is expired
-        if time.time() > entry['expires']:
+        if time.time() > entry.expires:
             self.delete(key)
             return None
-        
-        return entry['value']
+
+        # Refresh the entry's position in the LRU order
+        self.cache.move_to_end(key)
+        return entry
     
-    def set(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+    def set(self, key: str, status: int, headers: 'CIMultiDict[str]', body: bytes, ttl: Optional[int] = None) -> bool:
         """
-        Set a value in the cache.
-        
+        Store a response in the cache.
+
         Args:
             key: Cache key
-            value: Value to cache
+            status: Response status code
+            headers: Response headers
+            body: Response body
             ttl: Time-to-live in seconds (optional)
-            
+
         Returns:
-            True if the value was cached, False otherwise
+            True if the response was cached, False otherwise
         """
-        # Calculate entry size
-        entry_size = len(json.dumps(value).encode('utf-8'))
-        
+        # Size the entry structurally; serializing it just to measure
+        # would copy the response a second time
+        entry_size = 64 + len(body)
+        entry_size += sum(len(k) + len(v) for k, v in headers.items())
+
         # Check if entry is too large
         if entry_size > self.max_size:
             logging.warning(f"Cache entry too large: {entry_size} bytes")
             return False
-        
+
         # Remove old entry if exists
         if key in self.cache:
             self.delete(key)
-        
+
+        # Drop whatever has expired so the heap doesn't accumulate one
+        # tuple per set() for the life of a cache that never fills up
+        self._prune_expired()
+
         # Check if we need to make room
         if self.size + entry_size > self.max_size:
             self._evict(entry_size)
-        
+
         # Add entry
-        self.cache[key] = {
-            'value': value,
-            'expires': time.time() + (ttl or self.ttl),
-            'size': entry_size
-        }
+        expires = time.time() + (ttl or self.ttl)
+        self.cache[key] = _CacheEntry(status, headers, body, expires, entry_size)
+        heapq.heappush(self._expiry_heap, (expires, key))
         self.size += entry_size
-        
+
         return True
     
     def delete(self, key: str) -> bool:
@@ -100,36 +133,42 @@ class MemoryCache:
         Returns:
             True if the value was deleted, False otherwise
         """
-        if key not in self.cache:
+        entry = self.cache.pop(key, None)
+        if entry is None:
             return False
-        
-        # Update size
-        self.size -= self.cache[key]['size']
-        
-        # Remove entry
-        del self.cache[key]
-        
+
+        self.size -= entry.size
         return True
     
+    def _prune_expired(self):
+        """
+        Pop expired entries off the head of the expiry heap.
+
+        Heap entries for keys that were deleted or overwritten in the
+        meantime are simply skipped; they too drain away here once their
+        recorded expiry passes.
+        """
+        now = time.time()
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            expires, key = heapq.heappop(self._expiry_heap)
+            entry = self.cache.get(key)
+            if entry is not None and entry.expires <= now:
+                self.delete(key)
+
     def _evict(self, needed_space: int):
         """
         Evict entries to make room for a new entry.
-        
+
         Args:
             needed_space: Space needed in bytes
         """
-        # Sort entries by expiration time
-        entries = sorted(
-            [(k, v['expires']) for k, v in self.cache.items()],
-            key=lambda x: x[1]
-        )
-        
-        # Evict entries until we have enough space
-        for key, _ in entries:
-            if self.size + needed_space <= self.max_size:
-                break
-            
-            self.delete(key)
+        # Drop expired entries first
+        self._prune_expired()
+
+        # Then evict least-recently-used entries until the new entry fits
+        while self.cache and self.size + needed_space > self.max_size:
+            key, entry = self.cache.popitem(last=False)
+            self.size -= entry.size
 
 
 # Global cache instance
@@ -167,80 +206,75 @@ def _get_cache_key(request: web.Request) -> str:
     Returns:
         The cache key
     """
-    # Create a string representation of the request
-    key_parts = [
-        request.method,
-        str(request.url),
-        request.headers.get('Accept', ''),
-        request.headers.get('Accept-Encoding', '')
-    ]
-    
+    # Feed the request fields into the hash incrementally, separated by
+    # NUL bytes, instead of joining them into an intermediate string;
+    # blake2b is also substantially faster than md5
+    h = hashlib.blake2b(digest_size=16)
+    h.update(request.method.encode('utf-8'))
+    h.update(b'\0')
+    h.update(str(request.url).encode('utf-8'))
+    h.update(b'\0')
+    h.update(request.headers.get('Accept', '').encode('utf-8'))
+    h.update(b'\0')
+    h.update(request.headers.get('Accept-Encoding', '').encode('utf-8'))
+
     # Add query parameters
     for k, v in request.query.items():
-        key_parts.append(f"{k}={v}")
-    
-    # Generate a hash
-    key = hashlib.md5(''.join(key_parts).encode('utf-8')).hexdigest()
-    
-    return key
+        h.update(b'\0')
+        h.update(k.encode('utf-8'))
+        h.update(b'=')
+        h.update(v.encode('utf-8'))
 
+    return h.hexdigest()
 
-async def cache_middleware(request: web.Request, handler: Callable, config: Dict[str, Any]) -> web.Response:
+
+async def cache_middleware(request: web.Request, handler: Callable, cache: MemoryCache) -> web.Response:
     """
     Middleware for caching responses.
-    
+
     Args:
         request: The incoming request
         handler: The request handler
-        config: Server configuration
-        
+        cache: Cache instance, bound once by setup_middlewares
+
     Returns:
         The response
     """
     # Only cache GET requests
     if request.method != 'GET':
         return await handler(request)
-    
+
     # Skip caching for certain paths
-    skip_paths = ['/metrics', '/health']
-    if request.path in skip_paths:
+    if request.path in _SKIP_PATHS:
         return await handler(request)
-    
+
     # Generate cache key
     cache_key = _get_cache_key(request)
-    
+
     # Try to get from cache
-    cache = get_cache(config)
     cached = cache.get(cache_key)
-    
-    if cached:
+
+    if cached is not None:
         # Return cached response
         return web.Response(
-            status=cached['status'],
-            headers=cached['headers'],
-            body=cached['body']
+            status=cached.status,
+            headers=cached.headers,
+            body=cached.body
         )
-    
+
     # Process request
     response = await handler(request)
-    
-    # Cache response if cacheable
+
+    # Cache successful responses whose body is already in memory; the
+    # copied CIMultiDict keeps duplicate headers intact. Everything else
+    # — errors, streamed responses, bodies that could never be admitted —
+    # passes through untouched rather than being buffered just to be
+    # rejected or rebuilt
     if 200 <= response.status < 300:
-        # Read response body
-        body = await response.read()
-        
-        # Cache response
-        cache.set(cache_key, {
-            'status': response.status,
-            'headers': dict(response.headers),
-            'body': body
-        })
-        
-        # Create a new response with the same body
-        return web.Response(
-            status=response.status,
-            headers=response.headers,
-            body=body
-        )
-    
+        content_length = response.content_length
+        if content_length is not None and content_length <= cache.max_size:
+            body = getattr(response, 'body', None)
+            if isinstance(body, (bytes, bytearray)):
+                cache.set(cache_key, response.status, response.headers.copy(), bytes(body))
+
     return response
@@ -3,67 +3,72 @@ Rate limiting middleware
 """
 
 import time
+from array import array
 from typing import Dict, Any, Callable
 
 from aiohttp import web
 
+# Paths exempt from rate limiting
+_SKIP_PATHS = frozenset({'/metrics', '/health'})
 
-# Simple in-memory rate limiter
+
+# Approximate in-memory rate limiter
 class RateLimiter:
     """
-    Simple in-memory rate limiter.
+    Approximate token-bucket rate limiter over a fixed-size table.
+
+    Clients hash into one of 65536 buckets, so memory stays constant no
+    matter how many distinct addresses show up — an attacker rotating
+    through spoofed sources can't grow the table. Two clients sharing a
+    bucket share its budget, which for a rate limiter only errs towards
+    throttling slightly early.
     """
-    
+
+    _BUCKETS = 1 << 16
+    _BUCKET_MASK = _BUCKETS - 1
+
     def __init__(self, requests_per_minute: int, burst: int):
         """
         Initialize the rate limiter.
-        
+
         Args:
             requests_per_minute: Maximum number of requests per minute
             burst: Maximum burst size
         """
         self.requests_per_minute = requests_per_minute
         self.burst = burst
-        self.clients: Dict[str, Dict[str, Any]] = {}
-    
+        self.refill_rate = requests_per_minute / 60.0
+        # Flat double arrays of (tokens, updated_at) per bucket; timestamps
+        # come from time.monotonic so a wall-clock jump can't mint tokens
+        now = time.monotonic()
+        self._tokens = array('d', [float(burst)]) * self._BUCKETS
+        self._updated = array('d', [now]) * self._BUCKETS
+
     def is_allowed(self, client_id: str) -> bool:
         """
         Check if a client is allowed to make a request.
-        
+
         Args:
             client_id: Client identifier
-            
+
         Returns:
             True if the client is allowed, False otherwise
         """
-        now = time.time()
-        
-        # Initialize client data if not exists
-        if client_id not in self.clients:
-            self.clients[client_id] = {
-                'last_request': now,
-                'tokens': self.burst,
-                'updated_at': now
-            }
-            return True
-        
-        # Get client data
-        client = self.clients[client_id]
-        
-        # Calculate token refill
-        time_passed = now - client['updated_at']
-        token_refill = time_passed * (self.requests_per_minute / 60.0)
-        
-        # Update tokens
-        client['tokens'] = min(self.burst, client['tokens'] + token_refill)
-        client['updated_at'] = now
-        
-        # Check if client has enough tokens
-        if client['tokens'] >= 1.0:
-            client['tokens'] -= 1.0
-            client['last_request'] = now
+        idx = hash(client_id) & self._BUCKET_MASK
+        now = time.monotonic()
+
+        # Refill tokens for the time passed since the last update
+        tokens = self._tokens[idx] + (now - self._updated[idx]) * self.refill_rate
+        if tokens > self.burst:
+            tokens = self.burst
+        self._updated[idx] = now
+
+        # Check if the bucket has enough tokens
+        if tokens >= 1.0:
+            self._tokens[idx] = tokens - 1.0
             return True
         else:
+            self._tokens[idx] = tokens
             return False
 
 
@@ -92,29 +97,27 @@ def get_rate_limiter(config: Dict[str, Any]) -> RateLimiter:
     return _rate_limiter
 
 
-async def rate_limit_middleware(request: web.Request, handler: Callable, config: Dict[str, Any]) -> web.Response:
+async def rate_limit_middleware(request: web.Request, handler: Callable, limiter: RateLimiter) -> web.Response:
     """
     Middleware for rate limiting requests.
-    
+
     Args:
         request: The incoming request
         handler: The request handler
-        config: Server configuration
-        
+        limiter: Rate limiter instance, bound once by setup_middlewares
+
     Returns:
         The response
     """
     # Skip rate limiting for certain paths
-    skip_paths = ['/metrics', '/health']
-    if request.path in skip_paths:
+    if request.path in _SKIP_PATHS:
         return await handler(request)
-    
+
     # Get client identifier (IP address)
     client_id = request.remote
-    
+
     # Check if client is allowed
-    rate_limiter = get_rate_limiter(config)
-    if rate_limiter.is_allowed(client_id):
+    if limiter.is_allowed(client_id):
         return await handler(request)
     else:
         return web.Response(
@@ -4,23 +4,16 @@ Core proxy server implementation
 
 import asyncio
 import logging
-import ssl
-from typing import Dict, Any, Optional, List, Tuple
-
-import aiohttp
-from aiohttp import web
-
-from .handlers import (
-    ForwardProxyHandler,
-    ReverseProxyHandler,
-    Socks5ProxyHandler
-)
-from .middleware import (
-    setup_middlewares,
-    error_middleware
-)
+import os
+from typing import Dict, Any, Optional
+
 from .utils import setup_ssl
 
+# aiohttp — and the handler/middleware modules built on top of it — is
+# imported inside the methods that need it, so merely importing this
+# module (CLI --help, test collection) doesn't pay for aiohttp's import
+# tree
+
 
 class ProxyServer:
     """
@@ -35,11 +28,16 @@ class ProxyServer:
             config: Server configuration
             loop: Event loop to use (optional)
         """
+        from aiohttp import web
+
+        from .middleware import setup_middlewares, error_middleware
+
         self.config = config
         self.loop = loop or asyncio.get_event_loop()
         self.app = web.Application(middlewares=[error_middleware])
         self.runner = None
         self.site = None
+        self.socks5_server = None
         self.proxy_mode = config['proxy']['mode']
         
         # Set up the appropriate handler based on the proxy mode
@@ -55,10 +53,18 @@ class ProxyServer:
     
     def _setup_handlers(self):
         """Set up the appropriate handlers based on the proxy mode."""
+        from aiohttp import web
+
+        from .handlers import (
+            ForwardProxyHandler,
+            ReverseProxyHandler,
+            Socks5ProxyHandler
+        )
+
         if self.proxy_mode == 'forward':
             handler = ForwardProxyHandler(self.config)
             self.app.add_routes([
-                web.get('/{path:.*}', handler.handle),
+                web.get('/{path:.*}', handler.handle, allow_head=False),
                 web.post('/{path:.*}', handler.handle),
                 web.put('/{path:.*}', handler.handle),
                 web.delete('/{path:.*}', handler.handle),
@@ -69,7 +75,7 @@ class ProxyServer:
         elif self.proxy_mode == 'reverse':
             handler = ReverseProxyHandler(self.config)
             self.app.add_routes([
-                web.get('/{path:.*}', handler.handle),
+                web.get('/{path:.*}', handler.handle, allow_head=False),
                 web.post('/{path:.*}', handler.handle),
                 web.put('/{path:.*}', handler.handle),
                 web.delete('/{path:.*}', handler.handle),
@@ -83,56 +89,80 @@ class ProxyServer:
         else:
             raise ValueError(f"Unsupported proxy mode: {self.proxy_mode}")
     
+    def _reuse_port(self):
+        """Whether to bind with SO_REUSEPORT (multi-worker deployments)."""
+        # main() normalizes 'auto' before forking, but the config may come
+        # in unnormalized when the server is constructed directly
+        workers = self.config['server'].get('workers', 1)
+        if workers == 'auto':
+            workers = os.cpu_count() or 1
+        return True if workers > 1 else None
+
     async def start_socks5_server(self):
         """Start the SOCKS5 server if in SOCKS5 mode."""
         if self.proxy_mode != 'socks5':
             return
-        
+
         host = self.config['server']['host']
         port = self.config['server']['port']
-        
+
         server = await asyncio.start_server(
             self.socks5_handler.handle_connection,
             host,
             port,
-            ssl=self.ssl_context
+            ssl=self.ssl_context,
+            reuse_port=self._reuse_port()
         )
         
         logging.info(f"SOCKS5 proxy server running on {host}:{port}")
         return server
     
-    def start(self):
-        """Start the proxy server."""
+    async def start_async(self):
+        """Start the proxy server from within a running event loop."""
         host = self.config['server']['host']
         port = self.config['server']['port']
-        
+
         if self.proxy_mode == 'socks5':
             # Start SOCKS5 server
-            self.loop.create_task(self.start_socks5_server())
+            self.socks5_server = await self.start_socks5_server()
         else:
+            from aiohttp import web
+
             # Start HTTP/HTTPS proxy server
             self.runner = web.AppRunner(self.app)
-            self.loop.run_until_complete(self.runner.setup())
+            await self.runner.setup()
             self.site = web.TCPSite(
                 self.runner,
                 host,
                 port,
-                ssl_context=self.ssl_context
+                ssl_context=self.ssl_context,
+                reuse_port=self._reuse_port()
             )
-            self.loop.run_until_complete(self.site.start())
+            await self.site.start()
             logging.info(f"{self.proxy_mode.capitalize()} proxy server running on {host}:{port}")
+
+    def start(self):
+        """Start the proxy server (blocking until it is listening)."""
+        self.loop.run_until_complete(self.start_async())
     
     def close(self):
-        """Close the proxy server."""
-        if self.site:
-            self.site.stop()
-        
-        if self.runner:
-            return self.runner.cleanup()
-        
-        return asyncio.Future()
-    
+        """
+        Begin closing the proxy server.
+
+        Only synchronous teardown happens here; wait_closed() performs
+        the async cleanup of the site, runner and shared session.
+        """
+        if self.socks5_server:
+            self.socks5_server.close()
+
     async def wait_closed(self):
         """Wait for the server to close."""
+        from .handlers.base import close_session
+
+        if self.socks5_server:
+            await self.socks5_server.wait_closed()
+
         if self.runner:
             await self.runner.cleanup()
+
+        await close_session()
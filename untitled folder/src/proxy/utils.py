@@ -5,16 +5,29 @@ Utility functions
 import logging
 import os
 import ssl
-from typing import Dict, Any, Optional
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+# Loaded contexts keyed by the cert/key paths and their mtimes; building
+# a context parses the PEM chain and key each time, which is worth paying
+# once per unchanged pair rather than per caller. The lock keeps the
+# check-then-load sequence atomic when workers are spawned from threads
+_SSL_CONTEXT_CACHE: Dict[Tuple[str, str, int, int], ssl.SSLContext] = {}
+_SSL_CONTEXT_LOCK = threading.Lock()
 
 
 def setup_ssl(ssl_config: Dict[str, Any]) -> Optional[ssl.SSLContext]:
     """
     Set up SSL context.
-    
+
+    Repeated calls with an unchanged cert/key pair return the cached
+    context. In multi-worker deployments, call this in the parent before
+    forking so children inherit the parsed context instead of each
+    re-parsing the certificate chain.
+
     Args:
         ssl_config: SSL configuration
-        
+
     Returns:
         SSL context, or None if SSL is not enabled
     """
@@ -28,18 +41,26 @@ def setup_ssl(ssl_config: Dict[str, Any]) -> Optional[ssl.SSLContext]:
         logging.error("SSL is enabled but cert_file or key_file is not specified")
         return None
     
-    if not os.path.exists(cert_file):
-        logging.error(f"SSL certificate file not found: {cert_file}")
-        return None
-    
-    if not os.path.exists(key_file):
-        logging.error(f"SSL key file not found: {key_file}")
-        return None
-    
+    # No existence pre-checks: the stat and load below raise
+    # FileNotFoundError themselves, and checking first just adds syscalls
+    # and a window for the answer to change
     try:
-        context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
-        context.load_cert_chain(cert_file, key_file)
+        cache_key = (
+            cert_file,
+            key_file,
+            os.stat(cert_file).st_mtime_ns,
+            os.stat(key_file).st_mtime_ns
+        )
+        with _SSL_CONTEXT_LOCK:
+            context = _SSL_CONTEXT_CACHE.get(cache_key)
+            if context is None:
+                context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+                context.load_cert_chain(cert_file, key_file)
+                _SSL_CONTEXT_CACHE[cache_key] = context
         return context
+    except FileNotFoundError as e:
+        logging.error(f"SSL file not found: {e.filename}")
+        return None
     except Exception as e:
         logging.error(f"Error setting up SSL: {e}")
         return None
@@ -2,13 +2,16 @@
 Tests for configuration management
 """
 
-import os
-import tempfile
+import io
 import unittest
 import yaml
 
 from src.proxy.config import load_config, validate_config
 
+# Use the libyaml C dumper when available, matching the loader choice in
+# src.proxy.config
+_YAML_DUMPER = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
 
 class TestConfig(unittest.TestCase):
     """
@@ -16,30 +19,25 @@ class TestConfig(unittest.TestCase):
     """
     
     def test_load_config(self):
-        """Test loading configuration from a file."""
-        # Create a temporary config file
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            yaml.dump({
-                'server': {
-                    'host': '127.0.0.1',
-                    'port': 8080
-                },
-                'proxy': {
-                    'mode': 'forward'
-                }
-            }, f)
-        
-        try:
-            # Load the config
-            config = load_config(f.name)
-            
-            # Check the config
-            self.assertEqual(config['server']['host'], '127.0.0.1')
-            self.assertEqual(config['server']['port'], 8080)
-            self.assertEqual(config['proxy']['mode'], 'forward')
-        finally:
-            # Clean up
-            os.unlink(f.name)
+        """Test loading configuration from a file-like object."""
+        # Build the config in memory; no disk round-trip needed
+        source = io.StringIO(yaml.dump({
+            'server': {
+                'host': '127.0.0.1',
+                'port': 8080
+            },
+            'proxy': {
+                'mode': 'forward'
+            }
+        }, Dumper=_YAML_DUMPER))
+
+        # Load the config
+        config = load_config(source)
+
+        # Check the config
+        self.assertEqual(config['server']['host'], '127.0.0.1')
+        self.assertEqual(config['server']['port'], 8080)
+        self.assertEqual(config['proxy']['mode'], 'forward')
     
     def test_load_config_file_not_found(self):
         """Test loading configuration from a non-existent file."""
@@ -60,93 +58,40 @@ class TestConfig(unittest.TestCase):
         
         self.assertTrue(validate_config(config))
     
-    def test_validate_config_missing_server(self):
-        """Test validating a configuration with missing server section."""
-        config = {
-            'proxy': {
-                'mode': 'forward'
-            }
-        }
-        
-        self.assertFalse(validate_config(config))
-    
-    def test_validate_config_missing_proxy(self):
-        """Test validating a configuration with missing proxy section."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
-            }
-        }
-        
-        self.assertFalse(validate_config(config))
-    
-    def test_validate_config_missing_server_host(self):
-        """Test validating a configuration with missing server host."""
-        config = {
-            'server': {
-                'port': 8080
+    def test_validate_config_invalid(self):
+        """Test validating invalid configurations."""
+        cases = {
+            'missing server': {
+                'proxy': {'mode': 'forward'}
             },
-            'proxy': {
-                'mode': 'forward'
-            }
-        }
-        
-        self.assertFalse(validate_config(config))
-    
-    def test_validate_config_missing_server_port(self):
-        """Test validating a configuration with missing server port."""
-        config = {
-            'server': {
-                'host': '127.0.0.1'
+            'missing proxy': {
+                'server': {'host': '127.0.0.1', 'port': 8080}
             },
-            'proxy': {
-                'mode': 'forward'
-            }
-        }
-        
-        self.assertFalse(validate_config(config))
-    
-    def test_validate_config_missing_proxy_mode(self):
-        """Test validating a configuration with missing proxy mode."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
+            'missing server host': {
+                'server': {'port': 8080},
+                'proxy': {'mode': 'forward'}
             },
-            'proxy': {}
-        }
-        
-        self.assertFalse(validate_config(config))
-    
-    def test_validate_config_invalid_proxy_mode(self):
-        """Test validating a configuration with invalid proxy mode."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
+            'missing server port': {
+                'server': {'host': '127.0.0.1'},
+                'proxy': {'mode': 'forward'}
             },
-            'proxy': {
-                'mode': 'invalid'
-            }
-        }
-        
-        self.assertFalse(validate_config(config))
-    
-    def test_validate_config_reverse_missing_targets(self):
-        """Test validating a reverse proxy configuration with missing targets."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
+            'missing proxy mode': {
+                'server': {'host': '127.0.0.1', 'port': 8080},
+                'proxy': {}
+            },
+            'invalid proxy mode': {
+                'server': {'host': '127.0.0.1', 'port': 8080},
+                'proxy': {'mode': 'invalid'}
+            },
+            'reverse missing targets': {
+                'server': {'host': '127.0.0.1', 'port': 8080},
+                'proxy': {'mode': 'reverse', 'reverse': {}}
             },
-            'proxy': {
-                'mode': 'reverse',
-                'reverse': {}
-            }
         }
-        
-        self.assertFalse(validate_config(config))
+
+        for name, config in cases.items():
+            with self.subTest(name):
+                self.assertFalse(validate_config(config))
 
 
 if __name__ == '__main__':
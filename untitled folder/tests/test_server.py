@@ -3,94 +3,94 @@ Tests for the proxy server
 """
 
 import asyncio
+import functools
 import unittest
-from unittest.mock import patch, MagicMock
 
 from aiohttp import web
 from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
 
+import src.proxy.server as server_module
 from src.proxy.server import ProxyServer
 
+# Mode-specific proxy sections for the canned test configs
+_MODE_SECTIONS = {
+    'forward': {
+        'require_auth': False
+    },
+    'reverse': {
+        'targets': [
+            {
+                'name': 'test',
+                'host': 'example.com',
+                'port': 80
+            }
+        ]
+    },
+    'socks5': {
+        'require_auth': False
+    },
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _make_server(mode: str) -> ProxyServer:
+    """
+    Build a ProxyServer for a canned config, cached per mode.
+
+    The init tests only inspect construction results, so each mode's
+    server is built once and shared; tearDownClass clears the cache.
+    """
+    config = {
+        'server': {
+            'host': '127.0.0.1',
+            'port': 8080
+        },
+        'proxy': {
+            'mode': mode,
+            mode: _MODE_SECTIONS[mode]
+        }
+    }
+    return ProxyServer(config, TestProxyServer.loop)
+
 
 class TestProxyServer(unittest.TestCase):
     """
     Test cases for the proxy server.
     """
-    
-    def setUp(self):
-        """Set up the test case."""
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-    
-    def tearDown(self):
-        """Tear down the test case."""
-        self.loop.close()
-    
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one event loop shared by every test in the class."""
+        cls.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(cls.loop)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Drop the cached servers and close the shared event loop."""
+        _make_server.cache_clear()
+        cls.loop.close()
+        asyncio.set_event_loop(None)
+
     def test_init_forward_proxy(self):
         """Test initializing a forward proxy server."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
-            },
-            'proxy': {
-                'mode': 'forward',
-                'forward': {
-                    'require_auth': False
-                }
-            }
-        }
-        
-        server = ProxyServer(config, self.loop)
-        
+        server = _make_server('forward')
+
         self.assertEqual(server.proxy_mode, 'forward')
         self.assertIsNotNone(server.app)
         self.assertIsNone(server.ssl_context)
-    
+
     def test_init_reverse_proxy(self):
         """Test initializing a reverse proxy server."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
-            },
-            'proxy': {
-                'mode': 'reverse',
-                'reverse': {
-                    'targets': [
-                        {
-                            'name': 'test',
-                            'host': 'example.com',
-                            'port': 80
-                        }
-                    ]
-                }
-            }
-        }
-        
-        server = ProxyServer(config, self.loop)
-        
+        server = _make_server('reverse')
+
         self.assertEqual(server.proxy_mode, 'reverse')
         self.assertIsNotNone(server.app)
         self.assertIsNone(server.ssl_context)
-    
+
     def test_init_socks5_proxy(self):
         """Test initializing a SOCKS5 proxy server."""
-        config = {
-            'server': {
-                'host': '127.0.0.1',
-                'port': 8080
-            },
-            'proxy': {
-                'mode': 'socks5',
-                'socks5': {
-                    'require_auth': False
-                }
-            }
-        }
-        
-        server = ProxyServer(config, self.loop)
-        
+        server = _make_server('socks5')
+
         self.assertEqual(server.proxy_mode, 'socks5')
         self.assertIsNotNone(server.app)
         self.assertIsNone(server.ssl_context)
@@ -110,13 +110,18 @@ class TestProxyServer(unittest.TestCase):
         with self.assertRaises(ValueError):
             ProxyServer(config, self.loop)
     
-    @patch('src.proxy.server.setup_ssl')
-    def test_init_with_ssl(self, mock_setup_ssl):
+    def test_init_with_ssl(self):
         """Test initializing a proxy server with SSL."""
-        # Mock SSL context
-        mock_ssl_context = MagicMock()
-        mock_setup_ssl.return_value = mock_ssl_context
-        
+        # A plain sentinel and a recording stub are all this test needs;
+        # MagicMock construction and patch plumbing cost more than the
+        # code under test
+        sentinel_context = object()
+        calls = []
+
+        def fake_setup_ssl(ssl_config):
+            calls.append(ssl_config)
+            return sentinel_context
+
         config = {
             'server': {
                 'host': '127.0.0.1',
@@ -136,13 +141,18 @@ class TestProxyServer(unittest.TestCase):
                 }
             }
         }
-        
-        server = ProxyServer(config, self.loop)
-        
+
+        original_setup_ssl = server_module.setup_ssl
+        server_module.setup_ssl = fake_setup_ssl
+        try:
+            server = ProxyServer(config, self.loop)
+        finally:
+            server_module.setup_ssl = original_setup_ssl
+
         self.assertEqual(server.proxy_mode, 'forward')
         self.assertIsNotNone(server.app)
-        self.assertEqual(server.ssl_context, mock_ssl_context)
-        mock_setup_ssl.assert_called_once_with(config['security']['ssl'])
+        self.assertIs(server.ssl_context, sentinel_context)
+        self.assertEqual(calls, [config['security']['ssl']])
 
 
 class TestProxyServerIntegration(AioHTTPTestCase):